@@ -1,33 +1,36 @@
 import logging
-import numpy as np
 import pystac
 import sys
 
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
 from dotenv import load_dotenv, find_dotenv
 from papipyplug import parse_input, plugin_logger, print_results
-from typing import List
+from typing import List, Optional, Tuple
 
-from .utils.common import check_params, GEOM_HDF_IGNORE_PROPERTIES
-from .utils.ras_utils import RasStacGeom, new_geom_assets, ras_geom_asset_info
+from .utils.common import (
+    check_params,
+    setup_logging,
+    GEOM_CELL_SIZE_PROPERTIES,
+    GEOM_HDF_IGNORE_PROPERTIES,
+)
+from .utils.ras_utils import (
+    RasStacGeom,
+    cell_area_to_distance,
+    new_geom_assets,
+    ras_geom_asset_info,
+)
 from .utils.s3_utils import (
+    S3_MAX_WORKERS,
     verify_safe_prefix,
     s3_key_public_url_converter,
     split_s3_key,
     init_s3_resources,
-    get_basic_object_metadata,
+    get_objects_metadata,
     copy_item_to_s3,
     read_ras_geom_from_s3,
 )
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="""{"time": "%(asctime)s" , "level": "%(levelname)s", "message": "%(message)s"}""",
-    handlers=[logging.StreamHandler()],
-)
+setup_logging()
 
 load_dotenv(find_dotenv())
 
@@ -43,6 +46,32 @@ def new_geom_item(
     item_props_to_add: dict = None,
     minio_mode=False,
 ):
+    results, _ = _new_geom_item(
+        geom_hdf,
+        new_item_s3_key,
+        topo_assets,
+        lulc_assets,
+        mannings_assets,
+        other_assets,
+        item_props_to_remove,
+        item_props_to_add,
+        minio_mode,
+    )
+    return results
+
+
+def _new_geom_item(
+    geom_hdf: str,
+    new_item_s3_key: str,
+    topo_assets: list = None,
+    lulc_assets: list = None,
+    mannings_assets: list = None,
+    other_assets: list = None,
+    item_props_to_remove: List = None,
+    item_props_to_add: dict = None,
+    minio_mode=False,
+    executor: Executor = None,
+) -> Tuple[list, Optional[Future]]:
     verify_safe_prefix(new_item_s3_key)
     logging.info(f"Creating geom item: {new_item_s3_key}")
     item_public_url = s3_key_public_url_converter(
@@ -52,7 +81,8 @@ def new_geom_item(
 
     # Prep parameters
     bucket_name, _ = split_s3_key(geom_hdf)
-    other_assets.append(geom_hdf)
+    # Include the geom HDF once, without modifying the caller's list
+    other_assets = list(dict.fromkeys([*(other_assets or []), geom_hdf]))
 
     _, s3_client, s3_resource = init_s3_resources(minio_mode=minio_mode)
     bucket = s3_resource.Bucket(bucket_name)
@@ -75,42 +105,44 @@ def new_geom_item(
     )
 
     # Add assets to item
+    asset_entries = []
     for asset_type, asset_list in geom_assets.items():
-        logging.debug(asset_type)
         for asset_file in asset_list:
             _, asset_key = split_s3_key(asset_file)
-            logging.info(f"Adding asset {asset_file} to item")
-            obj = bucket.Object(asset_key)
-            try:
-                metadata = get_basic_object_metadata(obj)
-            except Exception as e:
-                logging.error(f"unable to fetch metadata for {obj}:{e}")
-                metadata = {}
-            asset_info = ras_geom_asset_info(asset_file, asset_type)
-            asset = pystac.Asset(
-                s3_key_public_url_converter(asset_file, minio_mode=minio_mode),
-                extra_fields=metadata,
-                roles=asset_info["roles"],
-                description=asset_info["description"],
-            )
-            item.add_asset(asset_info["title"], asset)
+            asset_entries.append((asset_type, asset_file, bucket.Object(asset_key)))
+
+    assets_metadata = get_objects_metadata(
+        [obj for _, _, obj in asset_entries], ignore_errors=True
+    )
+    for (asset_type, asset_file, _), metadata in zip(asset_entries, assets_metadata):
+        asset_info = ras_geom_asset_info(asset_file, asset_type)
+        asset = pystac.Asset(
+            s3_key_public_url_converter(asset_file, minio_mode=minio_mode),
+            extra_fields=metadata,
+            roles=asset_info["roles"],
+            description=asset_info["description"],
+        )
+        item.add_asset(asset_info["title"], asset)
+    logging.info(
+        f"Added {len(asset_entries)} assets across {len(geom_assets)} categories to item"
+    )
+    logging.debug(f"Assets added: {[asset_file for _, asset_file, _ in asset_entries]}")
 
     # Transform cell size properties to square root of area
-    for prop in [
-        "2d_flow_areas:cell_average_size",
-        "2d_flow_areas:cell_maximum_size",
-        "2d_flow_areas:cell_minimum_size",
-    ]:
-        try:
-            item.properties[prop] = int(np.sqrt(float(item.properties[prop])))
-        except KeyError:
-            logging.warning(f"property {prop} not found")
+    cell_area_to_distance(item.properties, GEOM_CELL_SIZE_PROPERTIES)
 
     logging.info("Writing geom item to s3")
     item.set_self_href(item_public_url)
-    copy_item_to_s3(item, new_item_s3_key, s3_client)
+    upload = copy_item_to_s3(item, new_item_s3_key, s3_client, executor=executor)
+    if upload is None:
+        logging.info("Program completed successfully")
+    else:
+        # Failed uploads are logged by copy_item_to_s3
+        def log_success(f):
+            if f.exception() is None:
+                logging.info("Program completed successfully")
 
-    logging.info("Program completed successfully")
+        upload.add_done_callback(log_success)
 
     results = [
         {
@@ -127,10 +159,10 @@ def new_geom_item(
         },
     ]
 
-    return results
+    return results, upload
 
 
-def main(params: dict, minio_mode=False):
+def _geom_item_args(params: dict) -> list:
     # Required parameters
     geom_hdf = params.get("geom_hdf", None)
     item_s3_key = params.get("new_item_s3_key", None)
@@ -143,7 +175,7 @@ def main(params: dict, minio_mode=False):
     item_props_to_remove = params.get("item_props_to_remove", [])
     item_props_to_add = params.get("item_props", {})
 
-    return new_geom_item(
+    return [
         geom_hdf,
         item_s3_key,
         topo_assets,
@@ -152,8 +184,59 @@ def main(params: dict, minio_mode=False):
         other_assets,
         item_props_to_remove,
         item_props_to_add,
-        minio_mode,
-    )
+    ]
+
+
+def main(params: dict, minio_mode=False):
+    return new_geom_item(*_geom_item_args(params), minio_mode)
+
+
+def submit_geom_item(
+    params: dict, executor: Executor, minio_mode=False
+) -> Tuple[list, Future]:
+    """
+    Creates a geom item like main, but submits the item upload to an executor instead of waiting for it, so batch
+    drivers can overlap the upload with the next item.
+
+    Parameters:
+        params (dict): The plugin parameters, as passed to main.
+        executor (Executor): The executor the item upload is submitted to.
+        minio_mode (bool, optional): If True, uses MinIO endpoint for S3. Defaults to False.
+
+    Returns:
+        results (list): The item links, valid once the upload has completed.
+        upload (Future): The pending upload. Its result() raises if the item could not be written.
+    """
+    return _new_geom_item(*_geom_item_args(params), minio_mode, executor)
+
+
+def new_geom_items(params_list: List[dict], minio_mode=False) -> List[list]:
+    """
+    Creates a geom item for each set of plugin parameters, uploading each item while the next one is built.
+    All uploads have completed when this returns.
+
+    Parameters:
+        params_list (List[dict]): The plugin parameters of each item, as passed to main.
+        minio_mode (bool, optional): If True, uses MinIO endpoint for S3. Defaults to False.
+
+    Returns:
+        List[list]: The item links of each item, in the order of params_list.
+
+    Raises:
+        RuntimeError: If any item could not be written. The first upload error is chained to it.
+    """
+    with ThreadPoolExecutor(max_workers=S3_MAX_WORKERS) as executor:
+        submitted = [
+            submit_geom_item(params, executor, minio_mode) for params in params_list
+        ]
+    # Leaving the executor waited for every upload, and each failure was already logged by copy_item_to_s3
+    errors = [upload.exception() for _, upload in submitted]
+    errors = [e for e in errors if e is not None]
+    if errors:
+        raise RuntimeError(
+            f"{len(errors)} of {len(submitted)} geom items could not be written"
+        ) from errors[0]
+    return [results for results, _ in submitted]
 
 
 if __name__ == "__main__":
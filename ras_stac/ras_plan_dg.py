@@ -2,11 +2,13 @@ import logging
 import pystac
 import sys
 
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from dotenv import find_dotenv, load_dotenv
 from rasterio.session import AWSSession
 from papipyplug import parse_input, plugin_logger, print_results
 
-from .utils.common import check_params
+from .utils.common import check_params, setup_logging
 from .utils.dg_utils import create_depth_grid_item
 from .utils.ras_utils import ras_plan_asset_info
 from .utils.s3_utils import (
@@ -14,19 +16,59 @@ from .utils.s3_utils import (
     s3_key_public_url_converter,
     split_s3_key,
     init_s3_resources,
-    get_basic_object_metadata,
+    get_objects_metadata,
+    object_metadata,
     copy_item_to_s3,
+    read_stac_item,
 )
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
+setup_logging()
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="""{"time": "%(asctime)s" , "level": "%(levelname)s", "message": "%(message)s"}""",
-    handlers=[logging.StreamHandler()],
-)
+
+def has_known_metadata(asset) -> bool:
+    """
+    This function checks whether an asset was given with its object metadata, so no request is needed for it.
+
+    Parameters:
+        asset (str | dict): The asset, either an S3 URL or a dict with an "href" key.
+
+    Returns:
+        bool: True if the asset is a dict with "size", "etag" and "last_modified" keys.
+    """
+    return isinstance(asset, dict) and all(
+        k in asset for k in ("size", "etag", "last_modified")
+    )
+
+
+def known_asset_metadata(asset: dict, s3_client) -> dict:
+    """
+    This function builds the metadata of an asset whose size, ETag and last modified date are supplied by the
+    caller, in the same form as `get_basic_object_metadata`, without issuing a request.
+
+    Parameters:
+        asset (dict): The asset, with "href", "size", "etag" and "last_modified" keys and an optional
+            "storage_class" key.
+        s3_client: The boto3 S3 client the asset is accessed with.
+
+    Returns:
+        dict: A dictionary with the size, ETag, last modified date, storage platform, region, and
+              storage tier of the asset.
+
+    Raises:
+        ValueError: If the size, ETag or last modified date has the wrong type.
+    """
+    size, etag, last_modified = asset["size"], asset["etag"], asset["last_modified"]
+    if isinstance(size, bool) or not isinstance(size, int):
+        raise ValueError(f"asset size must be an integer: {asset['href']}")
+    if not isinstance(etag, str):
+        raise ValueError(f"asset etag must be a string: {asset['href']}")
+    if not isinstance(last_modified, (str, datetime)):
+        raise ValueError(
+            f"asset last_modified must be a string or datetime: {asset['href']}"
+        )
+    return object_metadata(
+        s3_client, size, etag, last_modified, asset.get("storage_class")
+    )
 
 
 def new_plan_dg_item(
@@ -56,21 +98,37 @@ def new_plan_dg_item(
     bucket = s3_resource.Bucket(bucket_name)
     AWS_SESSION = AWSSession(session)
 
-    logging.info("pulling plan item")
-    plan_item = pystac.Item.from_file(plan_item_public_url)
-
-    _, key = split_s3_key(plan_dg)
-    dg_obj = bucket.Object(key)
+    # Assets given as dicts with their object metadata do not need a HEAD request
+    asset_files = [a["href"] if isinstance(a, dict) else a for a in asset_list]
+    known_metadata = {
+        a["href"]: known_asset_metadata(a, s3_client)
+        for a in asset_list
+        if has_known_metadata(a)
+    }
+    unknown_files = [a for a in asset_files if a not in known_metadata]
+    asset_objs = [bucket.Object(split_s3_key(a)[1]) for a in unknown_files]
+
+    # The plan item and asset metadata don't depend on the depth grid, so fetch them while it is being read
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        logging.info("pulling plan item")
+        plan_item_future = executor.submit(read_stac_item, plan_item_public_url)
+        assets_metadata_future = executor.submit(get_objects_metadata, asset_objs)
+
+        _, key = split_s3_key(plan_dg)
+        dg_obj = bucket.Object(key)
+
+        logging.info("fetching dg metadata")
+        dg_item = create_depth_grid_item(
+            dg_obj, dg_id, AWS_SESSION, minio_mode=minio_mode
+        )
+        plan_item = plan_item_future.result()
+        known_metadata.update(zip(unknown_files, assets_metadata_future.result()))
 
-    logging.info("fetching dg metadata")
-    dg_item = create_depth_grid_item(dg_obj, dg_id, AWS_SESSION, minio_mode=minio_mode)
     dg_item.properties.update(item_props)
     dg_item.add_derived_from(plan_item)
 
-    for asset_file in asset_list:
-        _, asset_key = split_s3_key(asset_file)
-        obj = bucket.Object(asset_key)
-        metadata = get_basic_object_metadata(obj)
+    for asset_file in asset_files:
+        metadata = known_metadata[asset_file]
         asset_info = ras_plan_asset_info(asset_file)
         asset = pystac.Asset(
             s3_key_public_url_converter(asset_file, minio_mode=minio_mode),
@@ -2,32 +2,26 @@ import logging
 import pystac
 import sys
 
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import find_dotenv, load_dotenv
 from papipyplug import parse_input, plugin_logger, print_results
 from typing import List
 
-from .utils.common import check_params, PLAN_HDF_IGNORE_PROPERTIES
+from .utils.common import check_params, setup_logging, PLAN_HDF_IGNORE_PROPERTIES
 from .utils.ras_utils import ras_plan_asset_info, RasStacPlan
 from .utils.s3_utils import (
     verify_safe_prefix,
     s3_key_public_url_converter,
     split_s3_key,
     init_s3_resources,
-    get_basic_object_metadata,
+    get_objects_metadata,
     copy_item_to_s3,
+    read_stac_item,
     read_ras_plan_from_s3,
 )
 
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
-
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format="""{"time": "%(asctime)s" , "level": "%(levelname)s", "message": "%(message)s"}""",
-    handlers=[logging.StreamHandler()],
-)
+setup_logging()
 
 
 def new_plan_item(
@@ -50,7 +44,8 @@ def new_plan_item(
 
     # Prep parameters
     bucket_name, _ = split_s3_key(plan_hdf)
-    asset_list.append(plan_hdf)
+    # Include the plan HDF once, without modifying the caller's list
+    asset_list = list(dict.fromkeys([*(asset_list or []), plan_hdf]))
 
     # Instantitate S3 resources
     session, s3_client, s3_resource = init_s3_resources(minio_mode)
@@ -59,13 +54,20 @@ def new_plan_item(
 
     logging.info("Creating plan item")
 
-    # Create geometry item
-    geom_item = pystac.Item.from_file(geom_item_public_url)
+    # The geom item and asset metadata don't depend on the plan HDF, so fetch them while it is being read
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        geom_item_future = executor.submit(read_stac_item, geom_item_public_url)
+        asset_objs = [bucket.Object(split_s3_key(a)[1]) for a in asset_list]
+        assets_metadata_future = executor.submit(get_objects_metadata, asset_objs)
+
+        logging.info("fetching plan metadata")
+        plan_hdf_obj = read_ras_plan_from_s3(plan_hdf, minio_mode)
+        ras_stac_plan = RasStacPlan(plan_hdf_obj)
+        plan_meta = ras_stac_plan.get_simulation_metadata(sim_id)
+
+        geom_item = geom_item_future.result()
+        assets_metadata = assets_metadata_future.result()
 
-    logging.info("fetching plan metadata")
-    plan_hdf_obj = read_ras_plan_from_s3(plan_hdf, minio_mode)
-    ras_stac_plan = RasStacPlan(plan_hdf_obj)
-    plan_meta = ras_stac_plan.get_simulation_metadata(sim_id)
     if plan_meta:
         try:
             logging.info("creating plan item")
@@ -88,19 +90,15 @@ def new_plan_item(
     plan_item.add_derived_from(geom_item)
     plan_item.properties.update(item_props)
 
-    if asset_list:
-        for asset_file in asset_list:
-            _, asset_key = split_s3_key(asset_file)
-            obj = bucket.Object(asset_key)
-            metadata = get_basic_object_metadata(obj)
-            asset_info = ras_plan_asset_info(asset_file)
-            asset = pystac.Asset(
-                s3_key_public_url_converter(asset_file, minio_mode=minio_mode),
-                extra_fields=metadata,
-                roles=asset_info["roles"],
-                description=asset_info["description"],
-            )
-            plan_item.add_asset(asset_info["title"], asset)
+    for asset_file, metadata in zip(asset_list, assets_metadata):
+        asset_info = ras_plan_asset_info(asset_file)
+        asset = pystac.Asset(
+            s3_key_public_url_converter(asset_file, minio_mode=minio_mode),
+            extra_fields=metadata,
+            roles=asset_info["roles"],
+            description=asset_info["description"],
+        )
+        plan_item.add_asset(asset_info["title"], asset)
 
     logging.info("Writing geom item to s3")
     plan_item.set_self_href(plan_item_public_url)
@@ -1,5 +1,25 @@
 from typing import List, Any
 import inspect
+import logging
+
+LOG_FORMAT = (
+    """{"time": "%(asctime)s" , "level": "%(levelname)s", "message": "%(message)s"}"""
+)
+
+
+def setup_logging(level: int = logging.INFO):
+    """
+    This function configures the JSON log format shared by the plugins and quiets the AWS SDK loggers. As with
+    `logging.basicConfig`, the root logger is left untouched if it already has handlers.
+
+    Parameters:
+        level (int, optional): The root logging level. Defaults to logging.INFO.
+    """
+    logging.getLogger("boto3").setLevel(logging.WARNING)
+    logging.getLogger("botocore").setLevel(logging.WARNING)
+    logging.basicConfig(
+        level=level, format=LOG_FORMAT, handlers=[logging.StreamHandler()]
+    )
 
 
 def check_params(func):
@@ -35,6 +55,13 @@ def get_dict_values(dicts: List[dict], key: Any) -> list:
     return results
 
 
+# 2D flow area cell size properties reported as areas, converted to cell side lengths on geom items
+GEOM_CELL_SIZE_PROPERTIES = (
+    "2d_flow_areas:cell_average_size",
+    "2d_flow_areas:cell_maximum_size",
+    "2d_flow_areas:cell_minimum_size",
+)
+
 GEOM_HDF_IGNORE_PROPERTIES = [
     "geometry:complete_geometry",
     "2d_flow_areas:cell_volume_tolerance",
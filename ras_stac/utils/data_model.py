@@ -19,16 +19,16 @@ class RasStacInputs:
         """
         Expects keys: "prefix/file.ext"
         """
-        topo_assets = [f"s3://{self.source_bucket_name}/{a}" for a in topo_assets]
-        lulc_assets = [f"s3://{self.source_bucket_name}/{a}" for a in lulc_assets]
-        mannings_assets = [
-            f"s3://{self.source_bucket_name}/{a}" for a in mannings_assets
-        ]
-        other_assets = [f"s3://{self.source_bucket_name}/{a}" for a in other_assets]
+        src = f"s3://{self.source_bucket_name}/"
+        dst = f"s3://{self.stac_bucket_name}/"
+        topo_assets = [src + a for a in topo_assets]
+        lulc_assets = [src + a for a in lulc_assets]
+        mannings_assets = [src + a for a in mannings_assets]
+        other_assets = [src + a for a in other_assets]
 
         return {
-            "geom_hdf": f"s3://{self.source_bucket_name}/{geom_hdf}",
-            "new_item_s3_key": f"s3://{self.stac_bucket_name}/{new_item_s3_key}",
+            "geom_hdf": src + geom_hdf,
+            "new_item_s3_key": dst + new_item_s3_key,
             "topo_assets": topo_assets,
             "mannings_assets": mannings_assets,
             "lulc_assets": lulc_assets,
@@ -47,12 +47,14 @@ class RasStacInputs:
         """
         Expects keys: "prefix/file.ext"
         """
-        ras_assets = [f"s3://{self.source_bucket_name}/{a}" for a in ras_assets]
+        src = f"s3://{self.source_bucket_name}/"
+        dst = f"s3://{self.stac_bucket_name}/"
+        ras_assets = [src + a for a in ras_assets]
 
         return {
-            "plan_hdf": f"s3://{self.source_bucket_name}/{plan_hdf}",
-            "new_plan_item_s3_key": f"s3://{self.stac_bucket_name}/{new_plan_item_s3_key}",
-            "geom_item_s3_key": f"s3://{self.stac_bucket_name}/{geom_item_s3_key}",
+            "plan_hdf": src + plan_hdf,
+            "new_plan_item_s3_key": dst + new_plan_item_s3_key,
+            "geom_item_s3_key": dst + geom_item_s3_key,
             "sim_id": sim_id,
             "item_props": item_props,
             "ras_assets": ras_assets,
@@ -1,5 +1,3 @@
-import json
-import logging
 import os
 import pystac
 import rasterio
@@ -7,17 +5,12 @@ import rasterio.warp
 
 from datetime import datetime, timezone
 from mypy_boto3_s3.service_resource import Object
-from pathlib import Path
 from rasterio.session import AWSSession
-from shapely import to_geojson
-from shapely.geometry import Polygon
+from shapely.geometry import Polygon, mapping
 from typing import Tuple
 
 from .s3_utils import s3_key_public_url_converter, get_basic_object_metadata
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
-
 
 def get_raster_bounds(
     s3_key: str, aws_session: AWSSession, minio_mode: bool = False
@@ -119,7 +112,7 @@ def create_depth_grid_item(
         is set to the GeoJSON representation of the bbox.
     """
     s3_full_key = f"s3://{s3_obj.bucket_name}/{s3_obj.key}"
-    title = Path(s3_obj.key).name
+    title = s3_obj.key.rsplit("/", 1)[-1]
     bbox = get_raster_bounds(s3_full_key, aws_session, minio_mode=minio_mode)
     geometry = bbox_to_polygon(bbox)
     item = pystac.Item(
@@ -127,7 +120,7 @@ def create_depth_grid_item(
         properties={},
         bbox=bbox,
         datetime=datetime.now(timezone.utc),
-        geometry=json.loads(to_geojson(geometry)),
+        geometry=mapping(geometry),
     )
     # non_null = not raster_is_all_null(depth_grid.key)
     asset = pystac.Asset(
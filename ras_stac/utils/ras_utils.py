@@ -1,21 +1,32 @@
 import logging
 from dotenv import load_dotenv, find_dotenv
 import pystac
-import json
-from typing import List
+from typing import List, Tuple
 import shapely
-from pathlib import Path
+import os
 import re
 from datetime import datetime
+from functools import lru_cache
+from math import sqrt
 
 from rashdf import RasPlanHdf, RasGeomHdf
 from rashdf.utils import parse_duration
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
-
 load_dotenv(find_dotenv())
 
+# Attribute groups read by read_stac_attr_groups, in order, as (rashdf getter, STAC prefix, name used in warnings)
+_GEOM_ATTR_GROUPS = (
+    ("get_root_attrs", None, "root"),
+    ("get_geom_attrs", "Geometry", "base geometry"),
+    ("get_geom_structures_attrs", "Structures", "geometry structures"),
+)
+_PLAN_ATTR_GROUPS = (
+    ("get_root_attrs", None, "root"),
+    ("get_plan_info_attrs", "Plan Information", "plan information"),
+    ("get_plan_param_attrs", "Plan Parameters", "plan parameters"),
+    ("get_meteorology_precip_attrs", "Meteorology", "meteorology precipitation"),
+)
+
 
 class RasStacGeom:
     def __init__(self, rg: RasGeomHdf):
@@ -28,29 +39,7 @@ class RasStacGeom:
         Returns:
             stac_geom_attrs (dict): A dictionary with the organized geometry attributes.
         """
-
-        stac_geom_attrs = self.rg.get_root_attrs()
-        if stac_geom_attrs is not None:
-            stac_geom_attrs = prep_stac_attrs(stac_geom_attrs)
-        else:
-            stac_geom_attrs = {}
-            logging.warning("No root attributes found.")
-
-        geom_attrs = self.rg.get_geom_attrs()
-        if geom_attrs is not None:
-            geom_stac_attrs = prep_stac_attrs(geom_attrs, prefix="Geometry")
-            stac_geom_attrs.update(geom_stac_attrs)
-        else:
-            logging.warning("No base geometry attributes found.")
-
-        structures_attrs = self.rg.get_geom_structures_attrs()
-        if structures_attrs is not None:
-            structures_stac_attrs = prep_stac_attrs(
-                structures_attrs, prefix="Structures"
-            )
-            stac_geom_attrs.update(structures_stac_attrs)
-        else:
-            logging.warning("No geometry structures attributes found.")
+        stac_geom_attrs = read_stac_attr_groups(self.rg, _GEOM_ATTR_GROUPS)
 
         d2_flow_area_attrs = self.rg.get_geom_2d_flow_area_attrs()
         if d2_flow_area_attrs is not None:
@@ -119,11 +108,10 @@ class RasStacGeom:
                 f"Could not find data for 'geometry:geometry_time' while creating model item for {ras_model_name}."
             )
 
-        for prop in props_to_remove:
-            try:
-                del properties[prop]
-            except KeyError:
-                logging.warning(f"Failed removing {prop}, property not found")
+        missing = remove_properties(properties, props_to_remove)
+        # The default ignore list covers properties that many geometries don't have, so this is expected
+        if missing:
+            logging.debug(f"Failed removing {sorted(missing)}, properties not found")
 
         iso_properties = properties_to_isoformat(properties)
 
@@ -132,7 +120,7 @@ class RasStacGeom:
 
         item = pystac.Item(
             id=stac_item_id,
-            geometry=json.loads(shapely.to_geojson(perimeter_polygon)),
+            geometry=shapely.geometry.mapping(perimeter_polygon),
             bbox=perimeter_polygon.bounds,
             datetime=geometry_time,
             properties=iso_properties,
@@ -180,13 +168,12 @@ class RasStacPlan(RasStacGeom):
         start_datetime = runtime_window[0]
         end_datetime = runtime_window[1]
 
-        for prop in item_props_to_remove:
-            try:
-                del results_meta[prop]
-            except KeyError:
-                logging.warning(
-                    f"Failed to remove property:{prop} not found in simulation results metadata."
-                )
+        missing = remove_properties(results_meta, item_props_to_remove)
+        # The default ignore list covers properties that many plans don't have, so this is expected
+        if missing:
+            logging.debug(
+                f"Failed to remove properties:{sorted(missing)} not found in simulation results metadata."
+            )
 
         properties = properties_to_isoformat(results_meta)
 
@@ -212,38 +199,8 @@ class RasStacPlan(RasStacGeom):
         Returns:
             stac_plan_attrs (dict): A dictionary with the attributes of the plan.
         """
-        stac_plan_attrs = self.rp.get_root_attrs()
-        if stac_plan_attrs is not None:
-            stac_plan_attrs = prep_stac_attrs(stac_plan_attrs)
-        else:
-            stac_plan_attrs = {}
-            logging.warning("No root attributes found.")
-
-        plan_info_attrs = self.rp.get_plan_info_attrs()
-        if plan_info_attrs is not None:
-            plan_info_stac_attrs = prep_stac_attrs(
-                plan_info_attrs, prefix="Plan Information"
-            )
-            stac_plan_attrs.update(plan_info_stac_attrs)
-        else:
-            logging.warning("No plan information attributes found.")
-
-        plan_params_attrs = self.rp.get_plan_param_attrs()
-        if plan_params_attrs is not None:
-            plan_params_stac_attrs = prep_stac_attrs(
-                plan_params_attrs, prefix="Plan Parameters"
-            )
-            stac_plan_attrs.update(plan_params_stac_attrs)
-        else:
-            logging.warning("No plan parameters attributes found.")
-
-        precip_attrs = self.rp.get_meteorology_precip_attrs()
-        if precip_attrs is not None:
-            precip_stac_attrs = prep_stac_attrs(precip_attrs, prefix="Meteorology")
-            precip_stac_attrs.pop("meteorology:projection", None)
-            stac_plan_attrs.update(precip_stac_attrs)
-        else:
-            logging.warning("No meteorology precipitation attributes found.")
+        stac_plan_attrs = read_stac_attr_groups(self.rp, _PLAN_ATTR_GROUPS)
+        stac_plan_attrs.pop("meteorology:projection", None)
 
         if include_results:
             stac_plan_attrs.update(self.rp.get_stac_plan_results_attrs())
@@ -262,29 +219,20 @@ class RasStacPlan(RasStacGeom):
 
         unsteady_results_attrs = self.rp.get_results_unsteady_attrs()
         if unsteady_results_attrs is not None:
-            unsteady_results_stac_attrs = prep_stac_attrs(
-                unsteady_results_attrs, prefix="Unsteady Results"
+            update_stac_attrs(
+                results_attrs, unsteady_results_attrs, prefix="Unsteady Results"
             )
-            results_attrs.update(unsteady_results_stac_attrs)
         else:
             logging.warning("No unsteady results attributes found.")
 
         summary_attrs = self.rp.get_results_unsteady_summary_attrs()
         if summary_attrs is not None:
-            summary_stac_attrs = prep_stac_attrs(
-                summary_attrs, prefix="Results Summary"
-            )
-            computation_time_total = str(
-                summary_stac_attrs.get("results_summary:computation_time_total")
-            )
+            # Only three summary attributes are kept, so read them directly instead of converting them all
+            computation_time_total = str(summary_attrs.get("Computation Time Total"))
             results_summary = {
                 "results_summary:computation_time_total": computation_time_total,
-                "results_summary:run_time_window": summary_stac_attrs.get(
-                    "results_summary:run_time_window"
-                ),
-                "results_summary:solution": summary_stac_attrs.get(
-                    "results_summary:solution"
-                ),
+                "results_summary:run_time_window": summary_attrs.get("Run Time Window"),
+                "results_summary:solution": summary_attrs.get("Solution"),
             }
             if computation_time_total is not None:
                 computation_time_total_minutes = (
@@ -299,10 +247,9 @@ class RasStacPlan(RasStacGeom):
 
         volume_accounting_attrs = self.rp.get_results_volume_accounting_attrs()
         if volume_accounting_attrs is not None:
-            volume_accounting_stac_attrs = prep_stac_attrs(
-                volume_accounting_attrs, prefix="Volume Accounting"
+            update_stac_attrs(
+                results_attrs, volume_accounting_attrs, prefix="Volume Accounting"
             )
-            results_attrs.update(volume_accounting_stac_attrs)
         else:
             logging.warning("No results volume accounting attributes found.")
 
@@ -358,7 +305,7 @@ def new_geom_assets(
 
     Returns:
         dict: A dictionary with keys "topo", "lulc", "mannings", and "other", and values being the corresponding input
-        parameters.
+        parameters. Asset types with no assets are omitted.
     """
     geom_assets = {
         "topo": topo_assets,
@@ -366,7 +313,15 @@ def new_geom_assets(
         "mannings": mannings_assets,
         "other": other_assets,
     }
-    return geom_assets
+    return {asset_type: assets for asset_type, assets in geom_assets.items() if assets}
+
+
+_GEOM_ASSET_DESCRIPTIONS = {
+    "mannings": "Friction surface used in HEC-RAS model geometry",
+    "lulc": "Land Use / Land Cover data used in HEC-RAS model geometry",
+    "topo": "Topo data used in HEC-RAS model geometry",
+    "other": "Other data used in HEC-RAS model geometry",
+}
 
 
 def ras_geom_asset_info(s3_key: str, asset_type: str) -> dict:
@@ -384,26 +339,12 @@ def ras_geom_asset_info(s3_key: str, asset_type: str) -> dict:
         ValueError: If the provided asset_type is not one of: "mannings", "lulc", "topo", "other".
     """
 
-    if asset_type not in ["mannings", "lulc", "topo", "other"]:
+    if asset_type not in _GEOM_ASSET_DESCRIPTIONS:
         raise ValueError("asset_type must be one of: mannings, lulc, topo, other")
 
-    file_extension = Path(s3_key).suffix
-    title = Path(s3_key).name
-
-    if asset_type == "mannings":
-        description = "Friction surface used in HEC-RAS model geometry"
-
-    elif asset_type == "lulc":
-        description = "Land Use / Land Cover data used in HEC-RAS model geometry"
-
-    elif asset_type == "topo":
-        description = "Topo data used in HEC-RAS model geometry"
-
-    elif asset_type == "other":
-        description = "Other data used in HEC-RAS model geometry"
-
-    else:
-        description = ""
+    title = s3_key.rsplit("/", 1)[-1]
+    file_extension = os.path.splitext(title)[1]
+    description = _GEOM_ASSET_DESCRIPTIONS[asset_type]
 
     if file_extension == ".hdf":
         roles = [pystac.MediaType.HDF, f"ras-{asset_type}"]
@@ -436,36 +377,62 @@ def ras_plan_asset_info(s3_key: str) -> dict:
       "dss", "log". If it doesn't match any of these patterns, it adds "ras-file" to the roles.
     5. Returns a dictionary with the roles, the description, and the title of the asset.
     """
-    file_extension = Path(s3_key).suffix
-    title = Path(s3_key).name
+    title = s3_key.rsplit("/", 1)[-1]
+    file_extension = os.path.splitext(title)[1]
+
+    if file_extension == ".hdf":
+        ras_extension = os.path.splitext(title[: -len(file_extension)])[1]
+    else:
+        ras_extension = file_extension
+
+    roles, description = _plan_asset_roles(file_extension, ras_extension.lstrip("."))
+
+    return {"roles": list(roles), "description": description, "title": title}
+
+
+# HEC-RAS geometry, plan, unsteady flow and steady flow file extensions, e.g. "g01"
+_RAS_EXTENSION_PATTERN = re.compile(r"([gpus])[0-9]{2}")
+
+
+@lru_cache(maxsize=4096)
+def _plan_asset_roles(file_extension: str, ras_extension: str) -> Tuple[tuple, str]:
+    """
+    Resolves the roles and description of a plan asset from its extensions. Results are cached since
+    only a handful of distinct extensions occur in a model, so the pattern matching runs once per extension.
+
+    Parameters:
+        file_extension (str): The final extension of the asset file, including the leading dot.
+        ras_extension (str): The HEC-RAS extension of the asset file without the leading dot.
+
+    Returns:
+        tuple: The roles of the asset as a tuple and the description of the asset.
+    """
     description = ""
     roles = []
 
     if file_extension == ".hdf":
-        ras_extension = Path(s3_key.replace(".hdf", "")).suffix
         roles.append(pystac.MediaType.HDF5)
-    else:
-        ras_extension = file_extension
 
-    ras_extension = ras_extension.lstrip(".")
+    ras_extension_match = _RAS_EXTENSION_PATTERN.match(ras_extension)
+    ras_file_type = ras_extension_match.group(1) if ras_extension_match else None
 
-    if re.match("g[0-9]{2}", ras_extension):
+    if ras_file_type == "g":
         roles.append("ras-geometry")
         if file_extension != ".hdf":
             roles.append(pystac.MediaType.TEXT)
             description = """The geometry file contains the 2D flow area perimeter and other geometry information."""
 
-    elif re.match("p[0-9]{2}", ras_extension):
+    elif ras_file_type == "p":
         roles.append("ras-plan")
         if file_extension != ".hdf":
             roles.append(pystac.MediaType.TEXT)
             description = """The plan file contains the simulation plan and other simulation information."""
 
-    elif re.match("u[0-9]{2}", ras_extension):
+    elif ras_file_type == "u":
         roles.extend(["ras-unsteady", pystac.MediaType.TEXT])
         description = """The unsteady file contains the unsteady flow results and other simulation information."""
 
-    elif re.match("s[0-9]{2}", ras_extension):
+    elif ras_file_type == "s":
         roles.extend(["ras-steady", pystac.MediaType.TEXT])
         description = """The steady file contains the steady flow results and other simulation information."""
 
@@ -484,9 +451,14 @@ def ras_plan_asset_info(s3_key: str) -> dict:
     else:
         roles.extend(["ras-file"])
 
-    return {"roles": roles, "description": description, "title": title}
+    return tuple(roles), description
+
 
+_NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
 
+
+@lru_cache(maxsize=4096)
 def to_snake_case(text):
     """
     Convert a string to snake case, removing punctuation and other symbols.
@@ -497,13 +469,11 @@ def to_snake_case(text):
     Returns:
         str: The snake case version of the string.
     """
-    import re
-
     # Remove all non-word characters (everything except numbers and letters)
-    text = re.sub(r"[^\w\s]", "", text)
+    text = _NON_WORD_PATTERN.sub("", text)
 
     # Replace all runs of whitespace with a single underscore
-    text = re.sub(r"\s+", "_", text)
+    text = _WHITESPACE_PATTERN.sub("_", text)
 
     return text.lower()
 
@@ -520,15 +490,48 @@ def prep_stac_attrs(attrs: dict, prefix: str = None) -> dict:
     Returns:
         results (dict): The new attribute dictionary snake case values and prefix.
     """
-    results = {}
+    return update_stac_attrs({}, attrs, prefix)
+
+
+def update_stac_attrs(stac_attrs: dict, attrs: dict, prefix: str = None) -> dict:
+    """
+    Adds an unformatted HDF attributes dictionary to an existing STAC attributes dictionary in place, converting
+    the keys to snake case and adding a prefix if one is given.
+
+    Parameters:
+        stac_attrs (dict): STAC attribute dictionary, updated in place.
+        attrs (dict): Unformatted attribute dictionary.
+        prefix (str): Optional prefix to be added to each key of formatted dictionary.
+
+    Returns:
+        stac_attrs (dict): The updated STAC attribute dictionary.
+    """
+    key_prefix = f"{to_snake_case(prefix)}:" if prefix else ""
     for k, value in attrs.items():
-        if prefix:
-            key = f"{to_snake_case(prefix)}:{to_snake_case(k)}"
-        else:
-            key = to_snake_case(k)
-        results[key] = value
+        stac_attrs[key_prefix + to_snake_case(k)] = value
+    return stac_attrs
+
+
+def read_stac_attr_groups(ras_hdf: RasGeomHdf, attr_groups: tuple) -> dict:
+    """
+    Reads several attribute groups from a HEC-RAS HDF file into a single STAC attributes dictionary.
 
-    return results
+    Parameters:
+        ras_hdf (RasGeomHdf): The HEC-RAS geometry or plan HDF file object.
+        attr_groups (tuple): (getter name, prefix, description) tuples, one per attribute group. Groups the file
+            doesn't have are skipped with a warning.
+
+    Returns:
+        stac_attrs (dict): The attributes of all groups in snake case, with the group prefixes added.
+    """
+    stac_attrs = {}
+    for getter, prefix, description in attr_groups:
+        attrs = getattr(ras_hdf, getter)()
+        if attrs is not None:
+            update_stac_attrs(stac_attrs, attrs, prefix)
+        else:
+            logging.warning(f"No {description} attributes found.")
+    return stac_attrs
 
 
 def ras_perimeter(rg: RasGeomHdf, simplify: float = None, crs: str = "EPSG:4326"):
@@ -547,13 +550,33 @@ def ras_perimeter(rg: RasGeomHdf, simplify: float = None, crs: str = "EPSG:4326"
 
     perimeter = rg.mesh_areas()
     perimeter = perimeter.to_crs(crs)
+    geoms = perimeter.geometry.to_numpy()
+    # The union passes a single 2D flow area through unchanged, so only run it when there is something to merge
+    if len(geoms) == 1 and not simplify:
+        return geoms[0]
+    perimeter_polygon = shapely.unary_union(geoms)
     if simplify:
-        perimeter_polygon = perimeter.geometry.unary_union.simplify(tolerance=simplify)
-    else:
-        perimeter_polygon = perimeter.geometry.unary_union
+        perimeter_polygon = perimeter_polygon.simplify(tolerance=simplify)
     return perimeter_polygon
 
 
+def remove_properties(properties: dict, props_to_remove: List[str]) -> set:
+    """Removes properties in place, skipping the ones that are not present
+
+    Parameters:
+        properties (dict): Properties dictionary, updated in place
+        props_to_remove (List[str]): Names of the properties to remove
+
+    Returns:
+        missing (set): Names of the properties that were not found
+    """
+    to_remove = set(props_to_remove)
+    present = to_remove & properties.keys()
+    for prop in present:
+        del properties[prop]
+    return to_remove - present
+
+
 def properties_to_isoformat(properties: dict):
     """Converts datetime objects in properties to isoformat
 
@@ -571,3 +594,21 @@ def properties_to_isoformat(properties: dict):
         elif isinstance(v, datetime):
             properties[k] = v.isoformat()
     return properties
+
+
+def cell_area_to_distance(properties: dict, props: List[str]) -> dict:
+    """Converts cell area properties to the side length of an equivalent square cell
+
+    Parameters:
+        properties (dict): Properties dictionary, updated in place
+        props (List[str]): Names of the cell area properties to convert
+
+    Returns:
+        properties (dict): Properties dictionary with the cell areas replaced by integer distances
+    """
+    for prop in props:
+        if prop in properties:
+            properties[prop] = int(sqrt(float(properties[prop])))
+        else:
+            logging.warning(f"property {prop} not found")
+    return properties
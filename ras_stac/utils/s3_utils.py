@@ -1,20 +1,134 @@
 import boto3
 import botocore
-import json
+import h5py
 import logging
 import re
-import os
 from rashdf import RasPlanHdf, RasGeomHdf
-from pathlib import Path
+import urllib3
+import orjson
+import os
+import pystac
+from botocore.config import Config
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime
+from functools import lru_cache
+from pystac.stac_io import DefaultStacIO
+from urllib.parse import quote
 
 from dotenv import load_dotenv, find_dotenv
 from mypy_boto3_s3.service_resource import ObjectSummary
 
-logging.getLogger("boto3").setLevel(logging.WARNING)
-logging.getLogger("botocore").setLevel(logging.WARNING)
-
 load_dotenv(find_dotenv())
 
+# h5py issues many small, scattered reads while walking HDF5 metadata. Reading remote files in 8 MiB blocks
+# kept in an LRU block cache coalesces those into a few large range requests.
+HDF_FSSPEC_KWARGS = {
+    "default_block_size": 8 * 1024 * 1024,
+    "default_cache_type": "blockcache",
+}
+
+# Raw data chunk cache for remote HDF files (h5py defaults to 1 MiB / 521 slots), sized so the chunked datasets
+# read while building STAC items stay resident instead of being re-fetched.
+HDF_H5PY_KWARGS = {
+    "rdcc_nbytes": 128 * 1024 * 1024,
+    # Prime number of chunk cache hash slots, to keep collisions between cached chunks rare
+    "rdcc_nslots": 10007,
+}
+
+# Keys between the first and last asset of a prefix are listed too, so stop after this many 1000-key LIST pages
+# and fetch whatever is left with HeadObject
+LIST_METADATA_MAX_PAGES = 2
+
+# RAS geometry and plan HDF file names, e.g. "model.g01.hdf" and "model.p01.hdf"
+_GEOM_HDF_PATTERN = re.compile(r".*\.g[0-9]{2}\.hdf$")
+_PLAN_HDF_PATTERN = re.compile(r".*\.p[0-9]{2}\.hdf$")
+
+DEFAULT_S3_MAX_WORKERS = 16
+
+
+def _s3_max_workers() -> int:
+    concurrency = os.environ.get("RAS_STAC_S3_CONCURRENCY")
+    if concurrency is None:
+        return DEFAULT_S3_MAX_WORKERS
+    try:
+        return max(1, int(concurrency))
+    except ValueError:
+        # This runs at import, before the plugins call setup_logging, and logging.warning would configure the root
+        # logger with the default format first
+        logging.getLogger(__name__).warning(
+            f"Invalid RAS_STAC_S3_CONCURRENCY {concurrency!r}, using {DEFAULT_S3_MAX_WORKERS}"
+        )
+        return DEFAULT_S3_MAX_WORKERS
+
+
+# Number of concurrent S3 requests used when fetching object metadata for item assets. Can be lowered with
+# RAS_STAC_S3_CONCURRENCY on slow or rate-limited connections.
+S3_MAX_WORKERS = _s3_max_workers()
+
+
+def open_hdf_ros3(hdf_class, s3_url: str):
+    """
+    Opens an HDF file stored in AWS S3 with the native HDF5 read-only S3 (ros3) driver, which reads the file
+    with page-aligned range requests without any Python-level file object in between.
+
+    Parameters:
+        hdf_class: The h5py.File subclass to open the file with (e.g. RasGeomHdf or RasPlanHdf).
+        s3_url (str): The S3 URL of the HDF file, in the format 's3://bucket/key'.
+
+    Returns:
+        The opened HDF file object, or None if h5py was built without the ros3 driver or the file could not be
+        opened with it, in which case callers should fall back to fsspec.
+    """
+    if "ros3" not in h5py.registered_drivers():
+        logging.debug("h5py was built without the ros3 driver")
+        return None
+
+    bucket, key = split_s3_key(s3_url)
+    session, s3_client, _ = init_s3_resources()
+    region = get_bucket_region(s3_client, bucket)
+    ros3_kwargs = {"aws_region": region.encode("utf-8")}
+    credentials = session.get_credentials()
+    if credentials is not None:
+        credentials = credentials.get_frozen_credentials()
+        ros3_kwargs["secret_id"] = credentials.access_key.encode("utf-8")
+        ros3_kwargs["secret_key"] = credentials.secret_key.encode("utf-8")
+        if credentials.token:
+            ros3_kwargs["session_token"] = credentials.token.encode("utf-8")
+
+    try:
+        return hdf_class(
+            f"https://{bucket}.s3.{region}.amazonaws.com/{quote(key)}",
+            driver="ros3",
+            **HDF_H5PY_KWARGS,
+            **ros3_kwargs,
+        )
+    # TypeError: h5py builds that predate session_token support reject the keyword
+    except (OSError, ValueError, TypeError) as e:
+        logging.debug(f"Unable to open {s3_url} with the ros3 driver: {e}")
+        return None
+
+
+@lru_cache(maxsize=None)
+def get_bucket_region(s3_client, bucket: str) -> str:
+    """
+    Looks up the AWS region of an S3 bucket, falling back to the client's region if the bucket location
+    cannot be read. Results are cached per client and bucket.
+
+    Parameters:
+        s3_client: The boto3 S3 client.
+        bucket (str): The name of the bucket.
+
+    Returns:
+        str: The region name, e.g. "us-east-1".
+    """
+    try:
+        # Buckets in us-east-1 have no location constraint
+        location = s3_client.get_bucket_location(Bucket=bucket)["LocationConstraint"]
+        return location or "us-east-1"
+    except botocore.exceptions.ClientError as e:
+        logging.debug(f"unable to get the location of bucket {bucket}: {e}")
+        return s3_client.meta.region_name or "us-east-1"
+
 
 def read_ras_geom_from_s3(ras_geom_hdf_url: str, minio_mode: bool = False):
     """
@@ -31,22 +145,32 @@ def read_ras_geom_from_s3(ras_geom_hdf_url: str, minio_mode: bool = False):
     Raises:
         ValueError: If the provided URL does not have a '.hdf' suffix.
     """
-    pattern = r".*\.g[0-9]{2}\.hdf$"
-    if not re.fullmatch(pattern, ras_geom_hdf_url):
+    if not _GEOM_HDF_PATTERN.fullmatch(ras_geom_hdf_url):
         raise ValueError(
-            f"RAS geom URL does not match pattern {pattern}: {ras_geom_hdf_url}"
+            f"RAS geom URL does not match pattern {_GEOM_HDF_PATTERN.pattern}: {ras_geom_hdf_url}"
         )
 
-    ras_model_name = Path(ras_geom_hdf_url.replace(".hdf", "")).stem
+    # The URL ends with ".gNN.hdf", so the model name is the file name before those two extensions
+    ras_model_name = ras_geom_hdf_url.rsplit("/", 1)[-1][: -len(".g01.hdf")]
 
     logging.info(f"Reading hdf file from {ras_geom_hdf_url}")
     if minio_mode:
         geom_hdf_obj = RasGeomHdf.open_uri(
             ras_geom_hdf_url,
-            fsspec_kwargs={"endpoint_url": os.environ.get("MINIO_S3_ENDPOINT")},
+            fsspec_kwargs={
+                "endpoint_url": os.environ.get("MINIO_S3_ENDPOINT"),
+                **HDF_FSSPEC_KWARGS,
+            },
+            h5py_kwargs=HDF_H5PY_KWARGS,
         )
     else:
-        geom_hdf_obj = RasGeomHdf.open_uri(ras_geom_hdf_url)
+        geom_hdf_obj = open_hdf_ros3(RasGeomHdf, ras_geom_hdf_url)
+        if geom_hdf_obj is None:
+            geom_hdf_obj = RasGeomHdf.open_uri(
+                ras_geom_hdf_url,
+                fsspec_kwargs=HDF_FSSPEC_KWARGS,
+                h5py_kwargs=HDF_H5PY_KWARGS,
+            )
 
     return geom_hdf_obj, ras_model_name
 
@@ -65,24 +189,114 @@ def read_ras_plan_from_s3(ras_plan_hdf_url: str, minio_mode: bool = False):
     Raises:
         ValueError: If the provided URL does not have a '.hdf' suffix.
     """
-    pattern = r".*\.p[0-9]{2}\.hdf$"
-    if not re.fullmatch(pattern, ras_plan_hdf_url):
+    if not _PLAN_HDF_PATTERN.fullmatch(ras_plan_hdf_url):
         raise ValueError(
-            f"RAS plan URL does not match pattern {pattern}: {ras_plan_hdf_url}"
+            f"RAS plan URL does not match pattern {_PLAN_HDF_PATTERN.pattern}: {ras_plan_hdf_url}"
         )
 
     logging.info(f"Reading hdf file from {ras_plan_hdf_url}")
     if minio_mode:
         plan_hdf_obj = RasPlanHdf.open_uri(
             ras_plan_hdf_url,
-            fsspec_kwargs={"endpoint_url": os.environ.get("MINIO_S3_ENDPOINT")},
+            fsspec_kwargs={
+                "endpoint_url": os.environ.get("MINIO_S3_ENDPOINT"),
+                **HDF_FSSPEC_KWARGS,
+            },
+            h5py_kwargs=HDF_H5PY_KWARGS,
         )
     else:
-        plan_hdf_obj = RasPlanHdf.open_uri(ras_plan_hdf_url)
+        plan_hdf_obj = open_hdf_ros3(RasPlanHdf, ras_plan_hdf_url)
+        if plan_hdf_obj is None:
+            plan_hdf_obj = RasPlanHdf.open_uri(
+                ras_plan_hdf_url,
+                fsspec_kwargs=HDF_FSSPEC_KWARGS,
+                h5py_kwargs=HDF_H5PY_KWARGS,
+            )
 
     return plan_hdf_obj
 
 
+class PooledStacIO(DefaultStacIO):
+    """
+    A pystac StacIO that reads http(s) hrefs through a shared keep-alive connection pool with retries, instead of
+    opening a new connection for every read. Other hrefs are read as usual.
+    """
+
+    def __init__(self, headers: dict = None):
+        super().__init__(headers=headers)
+        self.http = urllib3.PoolManager(
+            maxsize=S3_MAX_WORKERS,
+            # Once retries run out, hand back the last response so it is reported like any other failed read
+            retries=urllib3.Retry(
+                total=3,
+                backoff_factor=0.2,
+                status_forcelist=(500, 502, 503, 504),
+                raise_on_status=False,
+            ),
+            timeout=urllib3.Timeout(connect=10, read=30),
+        )
+
+    def read_text_from_href(self, href: str) -> str:
+        if not href.startswith(("http://", "https://")):
+            return super().read_text_from_href(href)
+
+        response = self.http.request("GET", href, headers=self.headers)
+        if not 200 <= response.status < 300:
+            raise Exception(f"Could not read uri {href}: HTTP {response.status}")
+        return response.data.decode("utf-8")
+
+
+STAC_IO = PooledStacIO()
+
+
+def read_stac_item(item_url: str) -> pystac.Item:
+    """
+    Reads a STAC item from a URL. Items are cached per URL, so repeated calls for the same item (e.g. many depth
+    grids derived from one plan item) are served from memory.
+
+    Parameters:
+        item_url (str): The URL of the STAC item.
+
+    Returns:
+        pystac.Item: A copy of the item, which can be modified without affecting the cache.
+    """
+    return _read_stac_item(item_url).clone()
+
+
+@lru_cache(maxsize=64)
+def _read_stac_item(item_url: str) -> pystac.Item:
+    return pystac.Item.from_file(item_url, stac_io=STAC_IO)
+
+
+def object_metadata(
+    s3_client, size: int, e_tag: str, last_modified, storage_class: str = None
+) -> dict:
+    """
+    This function builds the metadata of an S3 object, as added to STAC assets, from its individual fields.
+
+    Parameters:
+        s3_client: The boto3 S3 client the object is accessed with.
+        size (int): The size of the object in bytes.
+        e_tag (str): The ETag of the object, with or without surrounding quotes.
+        last_modified (datetime | str): The last modified date of the object, or its isoformat string.
+        storage_class (str, optional): The storage class of the object. Defaults to None.
+
+    Returns:
+        dict: A dictionary with the size, ETag, last modified date, storage platform, region, and
+              storage tier of the object.
+    """
+    if isinstance(last_modified, datetime):
+        last_modified = last_modified.isoformat()
+    return {
+        "file:size": size,
+        "e_tag": e_tag.strip('"'),
+        "last_modified": last_modified,
+        "storage:platform": "AWS",
+        "storage:region": s3_client.meta.region_name,
+        "storage:tier": storage_class,
+    }
+
+
 def get_basic_object_metadata(obj: ObjectSummary) -> dict:
     """
     This function retrieves basic metadata of an AWS S3 object.
@@ -96,39 +310,156 @@ def get_basic_object_metadata(obj: ObjectSummary) -> dict:
     """
     try:
         _ = obj.load()
-        return {
-            "file:size": obj.content_length,
-            "e_tag": obj.e_tag.strip('"'),
-            "last_modified": obj.last_modified.isoformat(),
-            "storage:platform": "AWS",
-            "storage:region": obj.meta.client.meta.region_name,
-            "storage:tier": obj.storage_class,
-        }
+        return object_metadata(
+            obj.meta.client,
+            obj.content_length,
+            obj.e_tag,
+            obj.last_modified,
+            obj.storage_class,
+        )
     except botocore.exceptions.ClientError:
         raise KeyError(
             f"Unable to access {obj.key} check that key exists and you have access"
         )
 
 
-def copy_item_to_s3(item, s3_key, s3client):
+def list_objects_metadata(objs: list) -> dict:
+    """
+    This function retrieves basic metadata of several AWS S3 objects from ListObjectsV2 responses rather
+    than one HeadObject request per object. Objects are grouped by bucket and parent prefix, and each group
+    holding more than one object is listed once (non-recursively), starting at its first key, until its last key
+    has been seen or LIST_METADATA_MAX_PAGES pages have been read.
+
+    Parameters:
+        objs (list): The AWS S3 objects.
+
+    Returns:
+        dict: A dictionary mapping (bucket, key) to the object's metadata, in the same form as
+              `get_basic_object_metadata`. Objects not found in a listing are omitted.
+    """
+    groups = {}
+    for obj in objs:
+        prefix = obj.key.rpartition("/")[0]
+        groups.setdefault((obj.bucket_name, prefix, obj.meta.client), set()).add(
+            obj.key
+        )
+
+    metadata = {}
+    for (bucket, prefix, client), keys in groups.items():
+        if len(keys) < 2:
+            continue
+        last_key = max(keys)
+        paginator = client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            Bucket=bucket,
+            Prefix=f"{prefix}/" if prefix else "",
+            Delimiter="/",
+            # Any string sorting before the first key; StartAfter itself is excluded from the listing
+            StartAfter=min(keys)[:-1],
+        )
+        try:
+            for page_number, page in enumerate(pages, start=1):
+                for content in page.get("Contents", ()):
+                    if content["Key"] in keys:
+                        storage_class = content.get("StorageClass", "STANDARD")
+                        metadata[(bucket, content["Key"])] = object_metadata(
+                            client,
+                            content["Size"],
+                            content["ETag"],
+                            content["LastModified"],
+                            # HeadObject omits the storage class for STANDARD objects
+                            None if storage_class == "STANDARD" else storage_class,
+                        )
+                if page.get("Contents") and page["Contents"][-1]["Key"] >= last_key:
+                    break
+                if page_number >= LIST_METADATA_MAX_PAGES:
+                    break
+        except botocore.exceptions.ClientError as e:
+            logging.warning(
+                f"unable to list s3://{bucket}/{prefix}, falling back to HEAD: {e}"
+            )
+    return metadata
+
+
+def get_objects_metadata(objs: list, ignore_errors: bool = False) -> list:
+    """
+    This function retrieves basic metadata of several AWS S3 objects. Objects sharing a prefix are resolved
+    with ListObjectsV2; the remaining ones are fetched with HeadObject, issuing the requests concurrently.
+
+    Parameters:
+        objs (list): The AWS S3 objects.
+        ignore_errors (bool, optional): If True, objects whose metadata cannot be retrieved are logged and given
+            empty metadata instead of raising. Defaults to False.
+
+    Returns:
+        list: The metadata dictionaries, as returned by `get_basic_object_metadata`, in the same order as `objs`.
+    """
+
+    def get_metadata(obj) -> dict:
+        try:
+            return get_basic_object_metadata(obj)
+        except Exception as e:
+            if not ignore_errors:
+                raise
+            logging.error(f"unable to fetch metadata for {obj}:{e}")
+            return {}
+
+    if not objs:
+        return []
+
+    listed = list_objects_metadata(objs)
+    missing = [obj for obj in objs if (obj.bucket_name, obj.key) not in listed]
+    if missing:
+        with ThreadPoolExecutor(
+            max_workers=min(S3_MAX_WORKERS, len(missing))
+        ) as executor:
+            for obj, metadata in zip(missing, executor.map(get_metadata, missing)):
+                listed[(obj.bucket_name, obj.key)] = metadata
+    return [listed[(obj.bucket_name, obj.key)] for obj in objs]
+
+
+def copy_item_to_s3(item, s3_key, s3client, executor: Executor = None):
     """
     This function copies an item to an AWS S3 bucket.
 
     Parameters:
         item: The item to copy. It must have a `to_dict` method that returns a dictionary representation of it.
         s3_key (str): The file path in the S3 bucket to copy the item to.
+        executor (Executor, optional): If given, the upload is submitted to this executor instead of being
+            waited on, so batch drivers can overlap it with the next item. Defaults to None.
+
+    Returns:
+        Future: The pending upload when an executor is given, otherwise None.
 
     The function performs the following steps:
         1. Initializes a boto3 S3 client and splits the s3_key into the bucket name and the key.
-        2. Converts the item to a dictionary, serializes it to a JSON string, and encodes it to bytes.
+        2. Converts the item to a dictionary and serializes it to JSON bytes with orjson.
         3. Puts the encoded JSON string to the specified file path in the S3 bucket.
     """
     # s3 = boto3.client("s3")
     bucket, key = split_s3_key(s3_key)
 
-    item_json = json.dumps(item.to_dict()).encode("utf-8")
+    item_json = orjson.dumps(item.to_dict(), option=orjson.OPT_SERIALIZE_NUMPY)
+    # Items are small, so a single PUT of the serialized bytes beats a multipart upload
+    put_kwargs = {
+        "Body": item_json,
+        "Bucket": bucket,
+        "Key": key,
+        "ContentType": "application/json",
+    }
 
-    s3client.put_object(Body=item_json, Bucket=bucket, Key=key)
+    if executor is None:
+        s3client.put_object(**put_kwargs)
+        return None
+
+    future = executor.submit(s3client.put_object, **put_kwargs)
+
+    def log_failure(f):
+        if f.exception() is not None:
+            logging.error(f"unable to upload item to {s3_key}:{f.exception()}")
+
+    future.add_done_callback(log_failure)
+    return future
 
 
 def split_s3_key(s3_path: str) -> tuple[str, str]:
@@ -174,8 +505,7 @@ def s3_key_public_url_converter(url: str, minio_mode: bool = False) -> str:
     """
 
     if url.startswith("s3"):
-        bucket = url.replace("s3://", "").split("/")[0]
-        key = url.replace(f"s3://{bucket}", "")[1:]
+        bucket, _, key = url.removeprefix("s3://").partition("/")
         if minio_mode:
             logging.info(
                 f"minio_mode | using minio endpoint for s3 url conversion: {url}"
@@ -192,8 +522,9 @@ def s3_key_public_url_converter(url: str, minio_mode: bool = False) -> str:
             bucket = url.replace(os.environ.get("MINIO_S3_ENDPOINT"), "").split("/")[0]
             key = url.replace(os.environ.get("MINIO_S3_ENDPOINT"), "")
         else:
-            bucket = url.replace("https://", "").split(".s3.amazonaws.com")[0]
-            key = url.replace(f"https://{bucket}.s3.amazonaws.com/", "")
+            bucket, _, key = url.removeprefix("https://").partition(
+                ".s3.amazonaws.com/"
+            )
 
         return f"s3://{bucket}/{key}"
 
@@ -206,15 +537,33 @@ def verify_safe_prefix(s3_key: str):
     TODO: discuss this with the team. Would like some safety mechanism to ensure that the S3 key is limited to
     certain prefixes. Should there be some restriction where these files can be written?
     """
-    parts = s3_key.split("/")
+    # Only the scheme, bucket and first prefix segment matter; don't split the rest of the key
+    parts = s3_key.split("/", 4)
     logging.debug(f"parts of the s3_key: {parts}")
-    if parts[3] != "stac":
+    if len(parts) < 5 or parts[3] != "stac":
         raise ValueError(
             f"prefix must begin with stac/, user provided {s3_key} needs to be corrected"
         )
 
 
 def init_s3_resources(minio_mode: bool = False):
+    """
+    Returns the boto3 session, S3 client and S3 resource, creating them on the first call for each mode so
+    that later calls reuse the same connection pool.
+
+    Parameters:
+        minio_mode (bool, optional): If True, connect to the MinIO endpoint instead of AWS. Defaults to False.
+
+    Returns:
+        tuple: The session, S3 client and S3 resource.
+    """
+    return _init_s3_resources(bool(minio_mode))
+
+
+@lru_cache(maxsize=None)
+def _init_s3_resources(minio_mode: bool):
+    # Allow one pooled connection per concurrent metadata request
+    config = Config(max_pool_connections=S3_MAX_WORKERS, retries={"mode": "adaptive"})
     if minio_mode:
         session = boto3.Session(
             aws_access_key_id=os.environ.get("MINIO_ACCESS_KEY_ID"),
@@ -222,11 +571,11 @@ def init_s3_resources(minio_mode: bool = False):
         )
 
         s3_client = session.client(
-            "s3", endpoint_url=os.environ.get("MINIO_S3_ENDPOINT")
+            "s3", endpoint_url=os.environ.get("MINIO_S3_ENDPOINT"), config=config
         )
 
         s3_resource = session.resource(
-            "s3", endpoint_url=os.environ.get("MINIO_S3_ENDPOINT")
+            "s3", endpoint_url=os.environ.get("MINIO_S3_ENDPOINT"), config=config
         )
 
         return session, s3_client, s3_resource
@@ -237,37 +586,64 @@ def init_s3_resources(minio_mode: bool = False):
             aws_secret_access_key=os.environ.get("AWS_SECRET_ACCESS_KEY"),
         )
 
-        s3_client = session.client("s3")
-        s3_resource = session.resource("s3")
+        s3_client = session.client("s3", config=config)
+        s3_resource = session.resource("s3", config=config)
         return session, s3_client, s3_resource
 
 
+def _reset_connections_after_fork():
+    _init_s3_resources.cache_clear()
+    get_bucket_region.cache_clear()
+    STAC_IO.http.clear()
+
+
+# boto3 sessions and pooled connections must not be shared with forked child processes
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_connections_after_fork)
+
+
 def list_keys(s3_client, bucket, prefix, suffix=""):
-    keys = []
-    kwargs = {"Bucket": bucket, "Prefix": prefix}
-    while True:
-        resp = s3_client.list_objects_v2(**kwargs)
-        keys += [obj["Key"] for obj in resp["Contents"] if obj["Key"].endswith(suffix)]
-        try:
-            kwargs["ContinuationToken"] = resp["NextContinuationToken"]
-        except KeyError:
-            break
-    return keys
+    """
+    Lists the keys under a prefix in an AWS S3 bucket.
+
+    Parameters:
+        s3_client: The boto3 S3 client.
+        bucket (str): The name of the bucket.
+        prefix (str): The prefix to list keys under.
+        suffix (str, optional): Only keys ending with this suffix are returned. Defaults to "".
+
+    Returns:
+        list: The keys matching the prefix and suffix, empty if nothing is listed under the prefix.
+    """
+    paginator = s3_client.get_paginator("list_objects_v2")
+    return [
+        obj["Key"]
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix)
+        for obj in page.get("Contents", ())
+        if obj["Key"].endswith(suffix)
+    ]
 
 
 def list_keys_regex(s3_client, bucket, prefix_includes, suffix=""):
-    keys = []
-    kwargs = {"Bucket": bucket, "Prefix": prefix_includes}
+    """
+    Lists the keys in an AWS S3 bucket matching a wildcard prefix.
+
+    Parameters:
+        s3_client: The boto3 S3 client.
+        bucket (str): The name of the bucket.
+        prefix_includes (str): The prefix to match, where "*" matches any sequence of characters.
+        suffix (str, optional): Only keys ending with this suffix are returned. Defaults to "".
+
+    Returns:
+        list: The keys matching the prefix pattern and suffix, empty if nothing matches.
+    """
     prefix_pattern = re.compile(prefix_includes.replace("*", ".*"))
-    while True:
-        resp = s3_client.list_objects_v2(**kwargs)
-        keys += [
-            obj["Key"]
-            for obj in resp["Contents"]
-            if prefix_pattern.match(obj["Key"]) and obj["Key"].endswith(suffix)
-        ]
-        try:
-            kwargs["ContinuationToken"] = resp["NextContinuationToken"]
-        except KeyError:
-            break
-    return keys
+    # S3 prefixes are literal, so only list under the part of the pattern before the first wildcard
+    list_prefix = prefix_includes.split("*", 1)[0]
+    paginator = s3_client.get_paginator("list_objects_v2")
+    return [
+        obj["Key"]
+        for page in paginator.paginate(Bucket=bucket, Prefix=list_prefix)
+        for obj in page.get("Contents", ())
+        if prefix_pattern.match(obj["Key"]) and obj["Key"].endswith(suffix)
+    ]
@@ -0,0 +1,47 @@
+from pathlib import Path
+from rashdf import RasGeomHdf, RasPlanHdf
+import orjson
+import pytest
+
+import sys
+
+sys.path.append("../")
+from ras_stac.utils.ras_utils import RasStacGeom, RasStacPlan
+
+TEST_DATA = Path("data")
+TEST_JSON = TEST_DATA / "json"
+TEST_RAS = TEST_DATA / "ras"
+TEST_GEOM = TEST_RAS / "Muncie.g05.hdf"
+TEST_PLAN = TEST_RAS / "Muncie.p04.hdf"
+
+
+@pytest.fixture(scope="session")
+def ras_geom_hdf():
+    """The test geometry HDF file, opened once per test session."""
+    with RasGeomHdf(TEST_GEOM) as ghdf:
+        yield ghdf
+
+
+@pytest.fixture(scope="session")
+def ras_stac_geom(ras_geom_hdf):
+    """RasStacGeom shared across tests."""
+    return RasStacGeom(ras_geom_hdf)
+
+
+@pytest.fixture(scope="session")
+def ras_plan_hdf():
+    """The test plan HDF file, opened once per test session."""
+    with RasPlanHdf(TEST_PLAN) as phdf:
+        yield phdf
+
+
+@pytest.fixture(scope="session")
+def ras_stac_plan(ras_plan_hdf):
+    """RasStacPlan shared across tests."""
+    return RasStacPlan(ras_plan_hdf)
+
+
+@pytest.fixture(scope="session")
+def expected_json():
+    """Expected test outputs, keyed by JSON file name without the extension and parsed once per test session."""
+    return {p.stem: orjson.loads(p.read_bytes()) for p in TEST_JSON.glob("*.json")}
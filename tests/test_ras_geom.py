@@ -1,69 +1,72 @@
-from pathlib import Path
-from rashdf import RasGeomHdf
+import geopandas as gpd
+import pytest
 import shapely
-import json
+import orjson
 
 import sys
 
 sys.path.append("../")
+from ras_stac import ras_geom_hdf
+from ras_stac.ras_geom_hdf import new_geom_item, new_geom_items
+from ras_stac.utils.common import check_params
 from ras_stac.utils.ras_utils import (
-    RasStacGeom,
+    cell_area_to_distance,
+    new_geom_assets,
     to_snake_case,
     prep_stac_attrs,
+    remove_properties,
     properties_to_isoformat,
+    ras_perimeter,
+    read_stac_attr_groups,
+    update_stac_attrs,
 )
 
-TEST_DATA = Path("data")
-TEST_JSON = TEST_DATA / "json"
-TEST_RAS = TEST_DATA / "ras"
-TEST_GEOM = TEST_RAS / "Muncie.g05.hdf"
-TEST_GEOM_ITEM = TEST_JSON / "test_geom_item.json"
-TEST_GEOM_PERIMETER = TEST_JSON / "test_perimeter.json"
-TEST_GEOM_PROPERTIES = TEST_JSON / "test_geom_properties.json"
 
-
-def test_geom_stac_item():
-    ghdf = RasGeomHdf(TEST_GEOM)
-    ras_stac_geom = RasStacGeom(ghdf)
+def test_geom_stac_item(ras_stac_geom, expected_json):
     item = ras_stac_geom.to_item(props_to_remove=[], ras_model_name="test-1")
     item.validate()
 
-    with open(TEST_GEOM_ITEM, "r") as f:
-        test_item_content = json.load(f)
-
-    item_dict = json.loads(json.dumps(item.to_dict()))
+    item_dict = orjson.loads(orjson.dumps(item.to_dict()))
 
-    assert item_dict == test_item_content
+    assert item_dict == expected_json["test_geom_item"]
 
 
-def test_geom_properties():
-    ghdf = RasGeomHdf(TEST_GEOM)
-    ras_stac_geom = RasStacGeom(ghdf)
+def test_geom_properties(ras_stac_geom, expected_json):
     test_properties = properties_to_isoformat(ras_stac_geom.get_stac_geom_attrs())
 
-    with open(TEST_GEOM_PROPERTIES, "r") as f:
-        properties_json = json.load(f)
+    assert test_properties == expected_json["test_geom_properties"]
 
-    assert test_properties == properties_json
 
+def test_geom_perimeter(ras_stac_geom, expected_json):
+    perimeter = ras_stac_geom.get_perimeter()
 
-def test_geom_perimeter():
-    ghdf = RasGeomHdf(TEST_GEOM)
-    ras_stac_geom = RasStacGeom(ghdf)
+    perimeter_json = expected_json["test_perimeter"]
+    json_geometry = shapely.geometry.shape(perimeter_json["geometry"])
+    json_bounds = tuple(perimeter_json["bounds"])
+
+    assert shapely.equals_exact(perimeter, json_geometry, tolerance=0)
+    assert perimeter.bounds == json_bounds
 
-    perimeter = ras_stac_geom.get_perimeter()
 
-    test_geom = json.loads(shapely.to_geojson(perimeter))
-    test_bounds = list(perimeter.bounds)
+SINGLE_AREA = shapely.Polygon([(0, 0), (0, 1), (1, 1), (1, 0)])
 
-    with open(TEST_GEOM_PERIMETER, "r") as f:
-        perimeter_json = json.load(f)
 
-    json_geometry = perimeter_json["geometry"]
-    json_bounds = perimeter_json["bounds"]
+class SingleAreaGeom:
+    def mesh_areas(self):
+        return gpd.GeoDataFrame(geometry=[SINGLE_AREA], crs="EPSG:4326")
 
-    assert test_geom == json_geometry
-    assert test_bounds == json_bounds
+
+def test_geom_perimeter_single_area():
+    perimeter = ras_perimeter(SingleAreaGeom())
+    assert shapely.equals_exact(perimeter, SINGLE_AREA, tolerance=0)
+    assert shapely.equals_exact(
+        perimeter, shapely.unary_union([SINGLE_AREA]), tolerance=0
+    )
+
+    simplified = ras_perimeter(SingleAreaGeom(), simplify=0.1)
+    assert shapely.equals_exact(
+        simplified, shapely.unary_union([SINGLE_AREA]).simplify(0.1), tolerance=0
+    )
 
 
 def test_to_snake_case():
@@ -82,3 +85,91 @@ def test_prep_stac_attrs():
         "prefix:attribute_two": "Value2",
     }
     assert prep_stac_attrs(attrs, prefix="prefix") == expected_result_with_prefix
+
+
+def test_update_stac_attrs():
+    stac_attrs = {"existing": 1}
+    attrs = {"Attribute One": "Value1"}
+    result = update_stac_attrs(stac_attrs, attrs, prefix="Plan Information")
+    assert result is stac_attrs
+    assert stac_attrs == {"existing": 1, "plan_information:attribute_one": "Value1"}
+
+
+def test_read_stac_attr_groups():
+    class Attrs:
+        def get_root_attrs(self):
+            return {"File Type": "HEC-RAS Geometry"}
+
+        def get_geom_attrs(self):
+            return None
+
+    attr_groups = (
+        ("get_root_attrs", None, "root"),
+        ("get_geom_attrs", "Geometry", "base geometry"),
+    )
+    assert read_stac_attr_groups(Attrs(), attr_groups) == {
+        "file_type": "HEC-RAS Geometry"
+    }
+
+
+def test_cell_area_to_distance():
+    properties = {"a": 100.0, "b": "2.25e4", "c": "other"}
+    result = cell_area_to_distance(properties, ["a", "b", "missing"])
+    assert result is properties
+    assert properties == {"a": 10, "b": 150, "c": "other"}
+
+
+def test_remove_properties():
+    properties = {"a": 1, "b": 2, "c": 3}
+    missing = remove_properties(properties, ["a", "c", "d", "a"])
+    assert properties == {"b": 2}
+    assert missing == {"d"}
+
+
+def test_new_geom_assets_skips_empty():
+    assets = new_geom_assets(topo_assets=None, lulc_assets=[], other_assets=["a.prj"])
+    assert assets == {"other": ["a.prj"]}
+
+
+def test_geom_plugin_params_exclude_executor():
+    plugin_params = check_params(new_geom_item)
+    assert "executor" not in plugin_params["required"] + plugin_params["optional"]
+
+
+def fake_geom_item(failing_keys, uploaded):
+    def _new_geom_item(geom_hdf, new_item_s3_key, *args):
+        executor = args[-1]
+
+        def upload():
+            if new_item_s3_key in failing_keys:
+                raise OSError(f"unable to write {new_item_s3_key}")
+            uploaded.append(new_item_s3_key)
+
+        return [{"href": new_item_s3_key}], executor.submit(upload)
+
+    return _new_geom_item
+
+
+def test_new_geom_items(monkeypatch):
+    uploaded = []
+    monkeypatch.setattr(ras_geom_hdf, "_new_geom_item", fake_geom_item((), uploaded))
+    keys = [f"s3://bucket/stac/geom-{i}.json" for i in range(3)]
+    params_list = [{"geom_hdf": "g", "new_item_s3_key": key} for key in keys]
+
+    assert new_geom_items(params_list) == [[{"href": key}] for key in keys]
+    assert sorted(uploaded) == keys
+
+
+def test_new_geom_items_upload_error(monkeypatch):
+    uploaded = []
+    keys = [f"s3://bucket/stac/geom-{i}.json" for i in range(3)]
+    monkeypatch.setattr(
+        ras_geom_hdf, "_new_geom_item", fake_geom_item({keys[1]}, uploaded)
+    )
+    params_list = [{"geom_hdf": "g", "new_item_s3_key": key} for key in keys]
+
+    with pytest.raises(RuntimeError, match="1 of 3") as error:
+        new_geom_items(params_list)
+    assert isinstance(error.value.__cause__, OSError)
+    # The other uploads still completed before the error was raised
+    assert sorted(uploaded) == [keys[0], keys[2]]
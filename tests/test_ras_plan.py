@@ -1,58 +1,56 @@
-from pathlib import Path
-from rashdf import RasPlanHdf
 import pystac
-import json
+import orjson
 
 import sys
 
 sys.path.append("../")
-from ras_stac.utils.ras_utils import RasStacPlan, properties_to_isoformat
-
-TEST_DATA = Path("data")
-TEST_JSON = TEST_DATA / "json"
-TEST_RAS = TEST_DATA / "ras"
-TEST_PLAN = TEST_RAS / "Muncie.p04.hdf"
-TEST_PLAN_ATTRS = TEST_JSON / "test_plan_attrs.json"
-TEST_PLAN_RESULTS_ATTRS = TEST_JSON / "test_plan_results_attrs.json"
-TEST_GEOM_ITEM = TEST_JSON / "test_geom_item.json"
-TEST_PLAN_ITEM = TEST_JSON / "test_plan_item.json"
-
-
-def test_plan_stac_item():
-    phdf = RasPlanHdf(TEST_PLAN)
-    ras_stac_plan = RasStacPlan(phdf)
-    geom_item = pystac.Item.from_file(TEST_GEOM_ITEM)
+from ras_stac.utils.ras_utils import (
+    properties_to_isoformat,
+    ras_plan_asset_info,
+)
+
+
+def test_plan_stac_item(ras_stac_plan, expected_json):
+    geom_item = pystac.Item.from_dict(expected_json["test_geom_item"])
     plan_meta = ras_stac_plan.get_simulation_metadata(simulation="test-1")
     plan_item = ras_stac_plan.to_item(
         geom_item, plan_meta, model_sim_id="test-1", item_props_to_remove=[]
     )
     plan_item.validate()
 
-    with open(TEST_PLAN_ITEM, "r") as f:
-        test_item_content = json.load(f)
+    item_dict = orjson.loads(orjson.dumps(plan_item.to_dict()))
 
-    item_dict = json.loads(json.dumps(plan_item.to_dict()))
+    assert item_dict == expected_json["test_plan_item"]
 
-    assert item_dict == test_item_content
 
-
-def test_plan_attrs():
-    phdf = RasPlanHdf(TEST_PLAN)
-    ras_stac_plan = RasStacPlan(phdf)
+def test_plan_attrs(ras_stac_plan, expected_json):
     test_attrs = properties_to_isoformat(ras_stac_plan.get_stac_plan_attrs())
 
-    with open(TEST_PLAN_ATTRS, "r") as f:
-        attrs_json = json.load(f)
-
-    assert test_attrs == attrs_json
+    assert test_attrs == expected_json["test_plan_attrs"]
 
 
-def test_plan_results_attrs():
-    phdf = RasPlanHdf(TEST_PLAN)
-    ras_stac_plan = RasStacPlan(phdf)
+def test_plan_results_attrs(ras_stac_plan, expected_json):
     test_attrs = properties_to_isoformat(ras_stac_plan.get_stac_plan_results_attrs())
 
-    with open(TEST_PLAN_RESULTS_ATTRS, "r") as f:
-        attrs_json = json.load(f)
+    assert test_attrs == expected_json["test_plan_results_attrs"]
+
+
+def test_ras_plan_asset_info():
+    plan_hdf_info = ras_plan_asset_info("s3://bucket/model/Muncie.p04.hdf")
+    assert plan_hdf_info["title"] == "Muncie.p04.hdf"
+    assert plan_hdf_info["roles"] == [pystac.MediaType.HDF5, "ras-plan"]
+    assert plan_hdf_info["description"] == ""
+
+    unsteady_info = ras_plan_asset_info("s3://bucket/model/Muncie.u01")
+    assert unsteady_info["title"] == "Muncie.u01"
+    assert unsteady_info["roles"] == ["ras-unsteady", pystac.MediaType.TEXT]
+
+    other_info = ras_plan_asset_info("s3://bucket/model/Muncie.rasmap")
+    assert other_info["roles"] == ["ras-file"]
 
-    assert test_attrs == attrs_json
+    # Roles are returned as a fresh list so callers may mutate them safely
+    plan_hdf_info["roles"].append("extra-role")
+    assert ras_plan_asset_info("s3://bucket/model/Muncie.p04.hdf")["roles"] == [
+        pystac.MediaType.HDF5,
+        "ras-plan",
+    ]
@@ -0,0 +1,62 @@
+from datetime import datetime, timezone
+import boto3
+import pytest
+
+import sys
+
+sys.path.append("../")
+from ras_stac.ras_plan_dg import has_known_metadata, known_asset_metadata
+
+ASSET = {
+    "href": "s3://bucket/model/Muncie.p04.hdf",
+    "size": 1024,
+    "etag": '"abc"',
+    "last_modified": "2024-01-01T00:00:00+00:00",
+}
+
+
+def make_client(**kwargs):
+    return boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        **kwargs,
+    )
+
+
+def test_has_known_metadata():
+    assert has_known_metadata(ASSET)
+    assert not has_known_metadata({"href": ASSET["href"], "size": 1024})
+    assert not has_known_metadata(ASSET["href"])
+
+
+def test_known_asset_metadata():
+    assert known_asset_metadata(ASSET, make_client()) == {
+        "file:size": 1024,
+        "e_tag": "abc",
+        "last_modified": "2024-01-01T00:00:00+00:00",
+        "storage:platform": "AWS",
+        "storage:region": "us-east-1",
+        "storage:tier": None,
+    }
+
+
+@pytest.mark.parametrize(
+    "endpoint_url",
+    ["https://s3.cn-north-1.amazonaws.com.cn", "http://localhost:9000"],
+)
+def test_known_asset_metadata_other_endpoints(endpoint_url):
+    asset = {**ASSET, "last_modified": datetime(2024, 1, 1, tzinfo=timezone.utc)}
+    client = make_client(endpoint_url=endpoint_url)
+    metadata = known_asset_metadata(asset, client)
+    assert metadata["storage:platform"] == "AWS"
+    assert metadata["last_modified"] == "2024-01-01T00:00:00+00:00"
+
+
+@pytest.mark.parametrize(
+    "field, value", [("size", "1024"), ("size", True), ("etag", None)]
+)
+def test_known_asset_metadata_invalid(field, value):
+    with pytest.raises(ValueError):
+        known_asset_metadata({**ASSET, field: value}, make_client())
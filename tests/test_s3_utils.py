@@ -0,0 +1,384 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import threading
+import boto3
+import h5py
+import pystac
+import pytest
+import urllib3
+from botocore.stub import ANY, Stubber
+
+import sys
+
+sys.path.append("../")
+from ras_stac.utils import s3_utils
+from ras_stac.utils.s3_utils import (
+    LIST_METADATA_MAX_PAGES,
+    PooledStacIO,
+    copy_item_to_s3,
+    get_objects_metadata,
+    list_keys,
+    list_keys_regex,
+    list_objects_metadata,
+    open_hdf_ros3,
+)
+
+
+@pytest.fixture
+def s3_client():
+    return boto3.client(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+
+
+@pytest.fixture
+def s3_resource():
+    return boto3.resource(
+        "s3",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+    )
+
+
+def make_item():
+    return pystac.Item(
+        id="test-1",
+        geometry=None,
+        bbox=None,
+        datetime=datetime(2024, 1, 1, tzinfo=timezone.utc),
+        properties={},
+    )
+
+
+def test_copy_item_to_s3_executor_failure(s3_client):
+    with Stubber(s3_client) as stubber:
+        stubber.add_client_error("put_object", "AccessDenied", http_status_code=403)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            upload = copy_item_to_s3(
+                make_item(), "s3://bucket/stac/item.json", s3_client, executor
+            )
+            with pytest.raises(s3_client.exceptions.ClientError):
+                upload.result()
+
+
+def test_copy_item_to_s3_executor_success(s3_client):
+    expected_params = {
+        "Body": ANY,
+        "Bucket": "bucket",
+        "Key": "stac/item.json",
+        "ContentType": "application/json",
+    }
+    with Stubber(s3_client) as stubber:
+        stubber.add_response("put_object", {}, expected_params)
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            upload = copy_item_to_s3(
+                make_item(), "s3://bucket/stac/item.json", s3_client, executor
+            )
+            upload.result()
+        stubber.assert_no_pending_responses()
+
+
+LAST_MODIFIED = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def list_content(key: str) -> dict:
+    return {"Key": key, "Size": 10, "ETag": '"abc"', "LastModified": LAST_MODIFIED}
+
+
+def list_params(**kwargs) -> dict:
+    return {
+        "Bucket": "bucket",
+        "Prefix": "model/",
+        "Delimiter": "/",
+        "StartAfter": "model/a.g0",
+        **kwargs,
+    }
+
+
+def test_list_objects_metadata_starts_at_first_key(s3_resource):
+    objs = [s3_resource.Object("bucket", k) for k in ("model/b.p01", "model/a.g01")]
+    with Stubber(s3_resource.meta.client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {
+                "Contents": [list_content("model/a.g01"), list_content("model/b.p01")],
+                "IsTruncated": False,
+            },
+            list_params(),
+        )
+        metadata = list_objects_metadata(objs)
+        stubber.assert_no_pending_responses()
+
+    assert metadata[("bucket", "model/a.g01")] == {
+        "file:size": 10,
+        "e_tag": "abc",
+        "last_modified": LAST_MODIFIED.isoformat(),
+        "storage:platform": "AWS",
+        "storage:region": "us-east-1",
+        "storage:tier": None,
+    }
+    assert set(metadata) == {("bucket", "model/a.g01"), ("bucket", "model/b.p01")}
+
+
+def test_list_objects_metadata_paginates_until_last_key(s3_resource):
+    objs = [s3_resource.Object("bucket", k) for k in ("model/a.g01", "model/c.u01")]
+    with Stubber(s3_resource.meta.client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {
+                "Contents": [list_content("model/a.g01"), list_content("model/b.tif")],
+                "IsTruncated": True,
+                "NextContinuationToken": "token",
+            },
+            list_params(),
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": [list_content("model/c.u01")], "IsTruncated": True},
+            list_params(ContinuationToken="token"),
+        )
+        metadata = list_objects_metadata(objs)
+        # The last key was seen, so the truncated second page isn't followed
+        stubber.assert_no_pending_responses()
+
+    assert set(metadata) == {("bucket", "model/a.g01"), ("bucket", "model/c.u01")}
+
+
+def test_get_objects_metadata_heads_keys_past_page_limit(s3_resource):
+    objs = [s3_resource.Object("bucket", k) for k in ("model/a.g01", "model/z.u01")]
+    with Stubber(s3_resource.meta.client) as stubber:
+        for page in range(LIST_METADATA_MAX_PAGES):
+            stubber.add_response(
+                "list_objects_v2",
+                {
+                    "Contents": [
+                        list_content(f"model/{'a.g01' if page == 0 else 'm'}")
+                    ],
+                    "IsTruncated": True,
+                    "NextContinuationToken": f"token{page}",
+                },
+                list_params(
+                    **({"ContinuationToken": f"token{page - 1}"} if page else {})
+                ),
+            )
+        stubber.add_response(
+            "head_object",
+            {"ContentLength": 20, "ETag": '"def"', "LastModified": LAST_MODIFIED},
+            {"Bucket": "bucket", "Key": "model/z.u01"},
+        )
+        metadata = get_objects_metadata(objs)
+        stubber.assert_no_pending_responses()
+
+    assert [m["file:size"] for m in metadata] == [10, 20]
+
+
+def test_list_objects_metadata_falls_back_on_error(s3_resource):
+    objs = [s3_resource.Object("bucket", k) for k in ("model/a.g01", "model/b.p01")]
+    with Stubber(s3_resource.meta.client) as stubber:
+        stubber.add_client_error(
+            "list_objects_v2", "AccessDenied", http_status_code=403
+        )
+        assert list_objects_metadata(objs) == {}
+
+
+def test_list_objects_metadata_skips_single_keys(s3_resource):
+    objs = [s3_resource.Object("bucket", "model/a.g01")]
+    with Stubber(s3_resource.meta.client):
+        # No responses are queued, so any request would fail
+        assert list_objects_metadata(objs) == {}
+
+
+def test_open_hdf_ros3_without_driver(monkeypatch):
+    monkeypatch.setattr(h5py, "registered_drivers", lambda: {"sec2"})
+
+    def hdf_class(*args, **kwargs):
+        raise AssertionError("the file should not be opened")
+
+    assert open_hdf_ros3(hdf_class, "s3://bucket/model/Muncie.g05.hdf") is None
+
+
+def test_open_hdf_ros3_kwargs(monkeypatch, s3_client):
+    session = boto3.Session(
+        aws_access_key_id="key-id",
+        aws_secret_access_key="secret",
+        region_name="us-east-1",
+    )
+    monkeypatch.setattr(h5py, "registered_drivers", lambda: {"ros3"})
+    monkeypatch.setattr(
+        s3_utils, "init_s3_resources", lambda: (session, s3_client, None)
+    )
+    opened = {}
+
+    def hdf_class(name, **kwargs):
+        opened.update(kwargs, name=name)
+        return "hdf"
+
+    with Stubber(s3_client) as stubber:
+        stubber.add_response(
+            "get_bucket_location",
+            {"LocationConstraint": "us-west-2"},
+            {"Bucket": "ros3-bucket"},
+        )
+        hdf = open_hdf_ros3(hdf_class, "s3://ros3-bucket/model/Muncie v2.g05.hdf")
+
+    assert hdf == "hdf"
+    assert opened["name"] == (
+        "https://ros3-bucket.s3.us-west-2.amazonaws.com/model/Muncie%20v2.g05.hdf"
+    )
+    assert opened["driver"] == "ros3"
+    assert opened["aws_region"] == b"us-west-2"
+    assert opened["secret_id"] == b"key-id"
+    assert opened["secret_key"] == b"secret"
+    assert "session_token" not in opened
+    assert opened["rdcc_nbytes"] == s3_utils.HDF_H5PY_KWARGS["rdcc_nbytes"]
+
+
+def test_open_hdf_ros3_open_error(monkeypatch, s3_client):
+    monkeypatch.setattr(h5py, "registered_drivers", lambda: {"ros3"})
+    monkeypatch.setattr(
+        s3_utils, "init_s3_resources", lambda: (boto3.Session(), s3_client, None)
+    )
+
+    def hdf_class(*args, **kwargs):
+        raise OSError("Unable to open file")
+
+    with Stubber(s3_client) as stubber:
+        stubber.add_client_error("get_bucket_location", "AccessDenied")
+        assert open_hdf_ros3(hdf_class, "s3://denied-bucket/model/a.g01.hdf") is None
+
+
+def test_open_hdf_ros3_session_token_unsupported(monkeypatch, s3_client):
+    session = boto3.Session(
+        aws_access_key_id="key-id",
+        aws_secret_access_key="secret",
+        aws_session_token="token",
+        region_name="us-east-1",
+    )
+    monkeypatch.setattr(h5py, "registered_drivers", lambda: {"ros3"})
+    monkeypatch.setattr(
+        s3_utils, "init_s3_resources", lambda: (session, s3_client, None)
+    )
+    opened = {}
+
+    def hdf_class(name, session_token=None, **kwargs):
+        opened["session_token"] = session_token
+        raise TypeError("__init__() got an unexpected keyword argument 'session_token'")
+
+    with Stubber(s3_client) as stubber:
+        stubber.add_response(
+            "get_bucket_location",
+            {"LocationConstraint": "us-east-2"},
+            {"Bucket": "token-bucket"},
+        )
+        assert open_hdf_ros3(hdf_class, "s3://token-bucket/model/a.g01.hdf") is None
+    assert opened["session_token"] == b"token"
+
+
+class FakeResponse:
+    def __init__(self, status: int, data: bytes = b""):
+        self.status = status
+        self.data = data
+
+
+def test_pooled_stac_io_reads_http(monkeypatch):
+    stac_io = PooledStacIO()
+    requests = []
+
+    def request(method, url, headers=None):
+        requests.append((method, url))
+        return FakeResponse(200, b'{"type": "Feature"}')
+
+    monkeypatch.setattr(stac_io.http, "request", request)
+    href = "https://bucket.s3.amazonaws.com/stac/item.json"
+    assert stac_io.read_text_from_href(href) == '{"type": "Feature"}'
+    assert requests == [("GET", href)]
+
+
+def test_pooled_stac_io_retries_exhausted(monkeypatch):
+    requests = []
+
+    class UnavailableHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append(self.path)
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    monkeypatch.setattr(urllib3.Retry, "sleep", lambda self, response=None: None)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UnavailableHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        href = f"http://127.0.0.1:{server.server_port}/stac/item.json"
+        with pytest.raises(Exception, match="Could not read uri .* HTTP 503"):
+            PooledStacIO().read_text_from_href(href)
+    finally:
+        server.shutdown()
+        server.server_close()
+    # The first attempt and its three retries
+    assert len(requests) == 4
+
+
+@pytest.mark.parametrize("status", [304, 404, 503])
+def test_pooled_stac_io_error_status(monkeypatch, status):
+    stac_io = PooledStacIO()
+    monkeypatch.setattr(
+        stac_io.http, "request", lambda *args, **kwargs: FakeResponse(status)
+    )
+    with pytest.raises(Exception, match=f"HTTP {status}"):
+        stac_io.read_text_from_href("https://bucket.s3.amazonaws.com/stac/item.json")
+
+
+def test_list_keys_empty(s3_client):
+    with Stubber(s3_client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {"KeyCount": 0, "IsTruncated": False},
+            {"Bucket": "bucket", "Prefix": "missing/"},
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"KeyCount": 0, "IsTruncated": False},
+            {"Bucket": "bucket", "Prefix": "missing/"},
+        )
+        assert list_keys(s3_client, "bucket", "missing/") == []
+        assert list_keys_regex(s3_client, "bucket", "missing/*.hdf") == []
+
+
+def test_list_keys_returns_lists(s3_client):
+    contents = [{"Key": key} for key in ("model/a.hdf", "model/b.txt", "other/c.hdf")]
+    with Stubber(s3_client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": contents[:2], "IsTruncated": False},
+            {"Bucket": "bucket", "Prefix": "model/"},
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"Contents": contents, "IsTruncated": False},
+            {"Bucket": "bucket", "Prefix": ""},
+        )
+        assert list_keys(s3_client, "bucket", "model/", ".hdf") == ["model/a.hdf"]
+        assert list_keys_regex(s3_client, "bucket", "*/[ac]", ".hdf") == [
+            "model/a.hdf",
+            "other/c.hdf",
+        ]
+
+
+@pytest.mark.parametrize(
+    "concurrency, expected", [(None, 16), ("4", 4), ("0", 1), ("eight", 16)]
+)
+def test_s3_max_workers(monkeypatch, concurrency, expected):
+    if concurrency is None:
+        monkeypatch.delenv("RAS_STAC_S3_CONCURRENCY", raising=False)
+    else:
+        monkeypatch.setenv("RAS_STAC_S3_CONCURRENCY", concurrency)
+    assert s3_utils._s3_max_workers() == expected
@@ -20,7 +20,7 @@ def create_perimeter_json(
     ras_stac_geom: RasStacGeom, output_json_fn: str = "test_perimeter.json"
 ):
     perimeter = ras_stac_geom.get_perimeter()
-    geometry = json.loads(shapely.to_geojson(perimeter))
+    geometry = shapely.geometry.mapping(perimeter)
     bounds = perimeter.bounds
     test_perimeter = {"geometry": geometry, "bounds": bounds}
     with open(output_json_fn, "w") as f: